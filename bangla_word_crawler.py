@@ -6,18 +6,37 @@ This program takes a list of domains and a list of Bangla words, crawls the
 specified domains, and outputs a CSV file with the URLs where each word was found.
 """
 
-import requests
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse
+import asyncio
+import aiohttp
+import regex
+from selectolax.lexbor import LexborHTMLParser
+from urllib.parse import urljoin, urlsplit, urlunsplit, parse_qsl, urlencode
+from urllib.robotparser import RobotFileParser
 import csv
-import time
-import re
 import argparse
-from collections import deque
 import logging
+import multiprocessing
+import os
+import platform
+import re
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+try:
+    from pybloom_live import ScalableBloomFilter
+except ImportError:
+    ScalableBloomFilter = None
 
 # --- Configuration & Logging ---
 logging.basicConfig(
@@ -30,132 +49,586 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Pages are read in chunks and cut off at this size
+MAX_PAGE_BYTES = 2 * 1024 * 1024
+# robots.txt files are parsed only up to this size
+MAX_ROBOTS_BYTES = 500 * 1024
+CHUNK_SIZE = 64 * 1024
+
+# --- Keyword Matching ---
+def build_keyword_matcher(keywords):
+    """
+    Returns a function that takes a page's text and returns the sorted
+    indices (into keywords) of the words found in it as substrings.
+
+    Prefers a Hyperscan literal database on x86_64 (SIMD scanning), then an
+    Aho-Corasick automaton when pyahocorasick is installed, and finally a
+    single compiled alternation pattern from the regex module. Either way
+    each page is scanned in one pass instead of once per keyword.
+    """
+    # A word listed twice is reported under its first index
+    order = {}
+    for index, word in enumerate(keywords):
+        order.setdefault(word, index)
+
+    if hyperscan is not None and platform.machine().lower() in ("x86_64", "amd64"):
+        database = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+        database.compile(
+            expressions=[word.encode("utf-8") for word in order],
+            ids=list(order.values()),
+            flags=hyperscan.HS_FLAG_SINGLEMATCH,
+            literal=True,
+        )
+
+        def match(text):
+            found = set()
+
+            def on_match(index, start, end, flags, context):
+                found.add(index)
+
+            database.scan(text.encode("utf-8"), match_event_handler=on_match)
+            return sorted(found)
+        return match
+
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for word, index in order.items():
+            automaton.add_word(word, index)
+        automaton.make_automaton()
+
+        def match(text):
+            return sorted({index for _, index in automaton.iter(text)})
+        return match
+
+    # Longest first so a keyword is not hidden behind a shorter prefix; a hit
+    # on a longer keyword also implies every keyword contained within it.
+    alternatives = sorted(order, key=len, reverse=True)
+    pattern = regex.compile("|".join(regex.escape(word) for word in alternatives))
+    contained = {word: {other for other in order if other in word} for word in order}
+
+    def match(text):
+        found = set()
+        # concurrent=True releases the GIL while the pattern is scanning
+        for hit in set(pattern.findall(text, overlapped=True, concurrent=True)):
+            found |= contained[hit]
+        return sorted(order[word] for word in found)
+    return match
+
+# --- Page Parsing ---
+def extract_links(base_url, tree):
+    """
+    Extracts all internal links from a parsed page as a dict mapping each
+    link's normalized form (the dedup key) to the URL to fetch. Links are
+    resolved against the page's own URL, not its normalized form, so that
+    relative links under a directory URL keep their trailing slash.
+    Root-relative and absolute links are resolved with string operations;
+    only the rarer relative forms go through urljoin.
+    """
+    base = urlsplit(base_url)
+    origin = f"{base.scheme}://{base.netloc}"
+    base_netloc = url_netloc(normalize_url(base_url) or "")
+    links = {}
+    for node in tree.css("a[href]"):
+        href = node.attributes.get("href")
+        if href is None:
+            continue
+        href = href.strip()
+        if not href or href.startswith("#"):
+            continue
+        try:
+            if href.startswith("/") and not href.startswith("//") and "/." not in href:
+                href = origin + href
+            elif href.startswith(("http://", "https://")):
+                netloc = href.split("://", 1)[1]
+                for sep in "/?#":
+                    netloc = netloc.split(sep, 1)[0]
+                if netloc.lower() != base_netloc and not any(c in netloc for c in ":@%"):
+                    continue  # Another plain host name: external link
+                if "/." in href:
+                    href = urljoin(base_url, href)
+            else:
+                href = urljoin(base_url, href)
+        except ValueError:
+            continue  # Unparsable, e.g. a malformed IPv6 host
+        href = href.split("#", 1)[0]
+        key = normalize_url(href)
+        # Ensure the link is within the same domain
+        if key and url_netloc(key) == base_netloc:
+            links.setdefault(key, href)
+    return links
+
+def page_text(tree):
+    """Returns the visible text of a parsed page, script and style excluded."""
+    if tree.root is None:
+        return ""
+    tree.strip_tags(["script", "style"])
+    return tree.root.text(separator=" ", strip=True)
+
+# Per-process keyword matcher, built once by _init_parse_worker()
+_worker_matcher = None
+
+def _init_parse_worker(keywords):
+    """ProcessPoolExecutor initializer: builds the keyword matcher once per worker."""
+    global _worker_matcher
+    _worker_matcher = build_keyword_matcher(keywords)
+
+def _parse_and_match(body, charset, base_url):
+    """
+    Parses a page in a worker process. Returns the indices of the keywords
+    found in its text and its internal links, as returned by extract_links().
+    """
+    # Decoding (or validating UTF-8) happens here, off the event loop
+    tree = LexborHTMLParser(decode_body(body, charset))
+    # Substring matching finds words like 'অভিলক্ষ্য' even when they are
+    # part of a larger string without spaces.
+    matches = _worker_matcher(page_text(tree))
+    return matches, extract_links(base_url, tree)
+
 # --- Core Web Crawler Class ---
 class BanglaWebCrawler:
-    def __init__(self, max_pages_per_domain, delay, max_workers):
+    """
+    Crawls each domain breadth-first and records the pages containing keywords.
+
+    With pybloom-live installed, the per-domain set of seen URLs is a
+    scalable Bloom filter. Deduplication is then approximate: a rare false
+    positive makes the crawler skip an unseen URL, but it never fetches a
+    page twice or reports a wrong match.
+    """
+    def __init__(self, keywords, max_pages_per_domain, delay, max_workers, per_host_concurrency=4,
+                 deny_pattern=None):
+        self.keywords = keywords
         self.max_pages_per_domain = max_pages_per_domain
         self.delay = delay
         self.max_workers = max_workers
-        self.found_matches = []
-        self.lock = threading.Lock()
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.per_host_concurrency = per_host_concurrency
+        # Compiled regex; links matching it are never queued
+        self.deny_pattern = deny_pattern
+        # Matches are streamed to the output CSV as they are found
+        self.match_count = 0
+        self._csv_file = None
+        self._csv_writer = None
+        self.headers = {
             "User-Agent": "Mozilla/5.0 (compatible; BanglaCrawler/1.0)",
             "Accept-Language": "bn-BD,bn;q=0.9,en-US;q=0.8,en;q=0.7"
-        })
+        }
+        # Product token matched against robots.txt User-agent lines
+        self.robots_agent = "BanglaCrawler"
+        self.timeout = aiohttp.ClientTimeout(total=10)
+        # Created inside the running event loop by _run_async()
+        self.semaphore = None
+        # Host -> scheme that last worked for it, so HTTP-only hosts skip the HTTPS attempt
+        self.scheme_preference = {}
+        # Created by run(); parses pages outside the event loop
+        self.parse_pool = None
+        self.parse_pool_restarts = 0
 
-    def fetch_page(self, url):
+    async def _get_html(self, session, url):
         """
-        Downloads HTML content of a page with an automatic HTTPS->HTTP fallback.
+        Performs a single GET, bounded by the shared request semaphore.
+        Returns the scheme of the final response (after redirects) and the
+        raw (body, charset) of the page, or None if it is not HTML.
         """
-        parsed_url = urlparse(url)
-        initial_scheme = parsed_url.scheme
+        async with self.semaphore:
+            async with session.get(url, timeout=self.timeout) as r:
+                r.raise_for_status()
+                final_scheme = r.url.scheme
+                if "text/html" not in r.headers.get("Content-Type", ""):
+                    return final_scheme, None
+                body = bytearray()
+                async for chunk in r.content.iter_chunked(CHUNK_SIZE):
+                    body += chunk
+                    if len(body) >= MAX_PAGE_BYTES:
+                        logger.info(f"Truncated {url} at {MAX_PAGE_BYTES} bytes.")
+                        del body[utf8_boundary(body, MAX_PAGE_BYTES):]
+                        break
+                return final_scheme, (bytes(body), r.charset)
+
+    async def fetch_page(self, session, url):
+        """
+        Downloads the raw (body, charset) of an HTML page with an automatic
+        HTTPS->HTTP fallback. The scheme a host finally answered on is
+        remembered and tried first next time. Only a connection-level failure
+        (refused, unreachable, TLS) lets the fallback change that preference;
+        HTTP errors are not retried and timeouts never switch schemes.
+        """
+        # Queued URLs are absolute http(s) URLs, so they always carry a scheme
+        scheme, rest = url.split("://", 1)
+        host = rest.split("/", 1)[0].lower()
+        initial_scheme = self.scheme_preference.get(host, scheme)
         fallback_scheme = 'http' if initial_scheme == 'https' else 'https'
-        
-        # Build the fallback URL
-        fallback_url = parsed_url._replace(scheme=fallback_scheme).geturl()
 
         try:
-            r = self.session.get(url, timeout=10)
-            r.raise_for_status()
-            if "text/html" in r.headers.get("Content-Type", ""):
-                return r.text
-        except requests.RequestException as e:
-            logger.warning(f"Failed to fetch {url} ({e}). Attempting fallback to {fallback_scheme}...")
+            final_scheme, page = await self._get_html(session, f"{initial_scheme}://{rest}")
+            self.scheme_preference[host] = final_scheme
+            return page
+        except (aiohttp.ClientConnectorError, asyncio.TimeoutError) as e:
+            connection_failed = isinstance(e, aiohttp.ClientConnectorError)
+            logger.warning(f"Failed to fetch {url} ({e!r}). Attempting fallback to {fallback_scheme}...")
+        except aiohttp.ClientError as e:
+            logger.error(f"Failed to fetch {url}: {e!r}")
+            return None
+
+        try:
+            final_scheme, page = await self._get_html(session, f"{fallback_scheme}://{rest}")
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e_fallback:
+            logger.error(f"Fallback also failed for {url}: {e_fallback!r}")
+            return None
+        if connection_failed:
+            self.scheme_preference[host] = final_scheme
+        if page is not None:
+            logger.info(f"Fallback successful for {url}.")
+        return page
+
+    async def _load_robots(self, session, start_url):
+        """Fetches and parses the domain's robots.txt; returns None if there are no rules."""
+        rest = start_url.split("://", 1)[1].rstrip("/")
+        for scheme in ("https", "http"):
+            robots_url = f"{scheme}://{rest}/robots.txt"
             try:
-                r_fallback = self.session.get(fallback_url, timeout=10)
-                r_fallback.raise_for_status()
-                if "text/html" in r_fallback.headers.get("Content-Type", ""):
-                    logger.info(f"Fallback successful for {url}.")
-                    return r_fallback.text
-            except requests.RequestException as e_fallback:
-                logger.error(f"Fallback also failed for {url}: {e_fallback}")
+                async with self.semaphore:
+                    async with session.get(robots_url, timeout=self.timeout) as r:
+                        # The scheme that answered is the one to start the crawl with
+                        self.scheme_preference[rest] = r.url.scheme
+                        # Per RFC 9309: 401/403 and server errors mean full disallow
+                        # (RobotFileParser.read() also disallows on 5xx), while any
+                        # other 4xx means there are no rules
+                        if r.status in (401, 403) or r.status >= 500:
+                            logger.info(f"robots.txt for {rest} returned {r.status}; not crawling it.")
+                            robots = RobotFileParser(robots_url)
+                            robots.disallow_all = True
+                            return robots
+                        if r.status >= 400:
+                            return None
+                        body = bytearray()
+                        async for chunk in r.content.iter_chunked(CHUNK_SIZE):
+                            body += chunk
+                            if len(body) >= MAX_ROBOTS_BYTES:
+                                del body[utf8_boundary(body, MAX_ROBOTS_BYTES):]
+                                break
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                continue
+            robots = RobotFileParser(robots_url)
+            robots.parse(body.decode("utf-8", errors="replace").splitlines())
+            return robots
         return None
 
-    def extract_links(self, base_url, html):
-        """Extracts all internal links from the HTML."""
-        soup = BeautifulSoup(html, "lxml")
-        links = set()
-        for a in soup.find_all("a", href=True):
-            href = urljoin(base_url, a["href"])
-            # Ensure the link is within the same domain and strip URL fragments
-            if urlparse(href).netloc == urlparse(base_url).netloc:
-                links.add(href.split("#")[0])
-        return links
-
-    def search_keywords(self, html, keywords):
-        """Searches for Bangla keywords as substrings in the text content."""
-        found = []
-        text = BeautifulSoup(html, "lxml").get_text(" ", strip=True)
-        for word in keywords:
-            # Using re.search for substring matching to find words like 'অভিলক্ষ্য'
-            # even when they are part of a larger string without spaces.
-            if re.search(re.escape(word), text):
-                found.append(word)
-        return found
-
-    def crawl_domain(self, domain, keywords):
-        """Crawl the internal pages of a single domain."""
+    def _is_allowed(self, url, robots):
+        """Checks a URL against the deny pattern and the domain's robots.txt."""
+        if self.deny_pattern is not None and self.deny_pattern.search(url):
+            return False
+        return robots is None or robots.can_fetch(self.robots_agent, url)
+
+    def _create_parse_pool(self):
+        """
+        Starts the process pool for HTML parsing and keyword matching. Its
+        workers start lazily from inside the running loop, after resolver and
+        executor threads exist, so they must not be forked from this process.
+        """
+        start_methods = multiprocessing.get_all_start_methods()
+        return ProcessPoolExecutor(
+            max_workers=os.cpu_count(),
+            mp_context=multiprocessing.get_context(
+                "forkserver" if "forkserver" in start_methods else "spawn"
+            ),
+            initializer=_init_parse_worker,
+            initargs=(self.keywords,),
+        )
+
+    async def _parse_page(self, body, charset, url):
+        """
+        Runs _parse_and_match in the process pool. If a worker died (segfault,
+        OOM kill) the pool is broken for good, so it is rebuilt once; a second
+        breakage raises BrokenProcessPool, which aborts the crawl.
+        """
+        loop = asyncio.get_running_loop()
+        pool = self.parse_pool
+        try:
+            return await loop.run_in_executor(pool, _parse_and_match, body, charset, url)
+        except BrokenProcessPool:
+            if pool is self.parse_pool:
+                # First task to notice this pool is broken replaces it
+                if self.parse_pool_restarts >= 1:
+                    raise
+                logger.error("A parse worker died; restarting the parse pool.")
+                pool.shutdown(wait=False, cancel_futures=True)
+                self.parse_pool = self._create_parse_pool()
+                self.parse_pool_restarts += 1
+        return await loop.run_in_executor(self.parse_pool, _parse_and_match, body, charset, url)
+
+    async def _crawl_page(self, session, url, enqueued, queue, robots):
+        """Fetches one page, records its matches and queues its new links."""
+        page = await self.fetch_page(session, url)
+        if page is None or not page[0]:
+            return False
+
+        # Only the raw body, its charset and a URL cross the process boundary
+        body, charset = page
+        matches, new_links = await self._parse_page(body, charset, url)
+        # All tasks share a single event loop thread, so no lock is needed
+        if matches:
+            for word_idx in matches:
+                word = self.keywords[word_idx]
+                self._csv_writer.writerow((url, word))
+                logger.info(f"Found '{word}' at {url}")
+            self.match_count += len(matches)
+            # Flush per page so a crash keeps everything found so far
+            self._csv_file.flush()
+
+        for key, link in new_links.items():
+            if key not in enqueued:
+                # Filtered links are marked as seen too, so each is checked once
+                enqueued.add(key)
+                if self._is_allowed(link, robots):
+                    queue.put_nowait(link)
+        return True
+
+    async def crawl_domain(self, session, domain):
+        """
+        Crawl the internal pages of a single domain with a pool of worker
+        tasks sharing one frontier queue.
+        """
         logger.info(f"Starting to crawl domain: {domain}")
-        visited = set()
         # Start with a secure connection attempt
-        to_visit = deque([f"https://{domain}"])
+        start_url = f"https://{domain}"
+        start_key = normalize_url(start_url)
+        if start_key is None:
+            logger.error(f"Skipping domain {domain}: not a valid host name")
+            return
+        robots = await self._load_robots(session, start_key)
+        if not self._is_allowed(start_url, robots):
+            logger.info(f"Skipping domain {domain}: start page is disallowed")
+            return
+        # Links are deduplicated by their normalized form when queued, so
+        # every dequeued URL is new; the queue holds the URLs as linked
+        enqueued = create_seen_set()
+        enqueued.add(start_key)
+        queue = asyncio.Queue()
+        queue.put_nowait(start_url)
         pages_crawled = 0
+        in_flight = 0
+        loop = asyncio.get_running_loop()
+        next_request_at = loop.time()
+        throttle = asyncio.Lock()
+        budget = asyncio.Condition()
 
-        while to_visit and pages_crawled < self.max_pages_per_domain:
-            url = to_visit.popleft()
-            if url in visited:
-                continue
-            visited.add(url)
+        async def wait_for_turn():
+            # Requests to this host start at least `delay` seconds apart,
+            # however many workers are waiting; other domains are unaffected
+            nonlocal next_request_at
+            async with throttle:
+                wait = next_request_at - loop.time()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                next_request_at = loop.time() + self.delay
 
-            html = self.fetch_page(url)
-            if not html:
-                continue
+        async def worker():
+            nonlocal pages_crawled, in_flight
+            while True:
+                url = await queue.get()
+                try:
+                    async with budget:
+                        # While in-flight fetches may still fail and give their
+                        # slot back, wait rather than dropping this URL
+                        await budget.wait_for(
+                            lambda: pages_crawled + in_flight < self.max_pages_per_domain or in_flight == 0
+                        )
+                        # Once the page budget is spent, drain what is left
+                        if pages_crawled >= self.max_pages_per_domain:
+                            continue
+                        in_flight += 1
+                    try:
+                        await wait_for_turn()
+                        if await self._crawl_page(session, url, enqueued, queue, robots):
+                            pages_crawled += 1
+                    except BrokenProcessPool:
+                        # Parsing is impossible from here on; crawl_domain re-raises this
+                        raise
+                    except Exception as e:
+                        # One bad page must not kill the worker and stall queue.join()
+                        logger.error(f"Error crawling {url}: {e!r}")
+                    finally:
+                        async with budget:
+                            in_flight -= 1
+                            budget.notify_all()
+                finally:
+                    queue.task_done()
+
+        workers = [asyncio.create_task(worker()) for _ in range(self.per_host_concurrency)]
+        # Workers only stop on a broken parse pool, so stop waiting when one does
+        joined = asyncio.create_task(queue.join())
+        try:
+            await asyncio.wait([joined, *workers], return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            joined.cancel()
+            for task in workers:
+                task.cancel()
+            results = await asyncio.gather(joined, *workers, return_exceptions=True)
+        for result in results:
+            if isinstance(result, BrokenProcessPool):
+                raise result
 
-            matches = self.search_keywords(html, keywords)
-            if matches:
-                with self.lock:
-                    for word in matches:
-                        self.found_matches.append({"URL": url, "Matched Word": word})
-                        logger.info(f"Found '{word}' at {url}")
-
-            new_links = self.extract_links(url, html)
-            for link in new_links:
-                if link not in visited:
-                    to_visit.append(link)
-
-            pages_crawled += 1
-            time.sleep(self.delay)
-        
         logger.info(f"Finished crawling domain: {domain} ({pages_crawled} pages)")
 
-    def run(self, domains, words, output_file):
+    def run(self, domains, output_file):
         """Main method to run the crawler on all domains."""
         logger.info("Starting Bangla Word Web Crawler")
-        
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            future_to_domain = {executor.submit(self.crawl_domain, domain, words): domain for domain in domains}
-            for future in as_completed(future_to_domain):
-                future.result()  # Wait for threads to complete
-
-        self.save_results(output_file)
+        try:
+            self.open_results(output_file)
+        except OSError as e:
+            logger.error(f"Error opening {output_file}: {e}")
+            return
+        # HTML parsing and keyword matching are CPU-bound, so they run in worker
+        # processes and leave the event loop free for network I/O
+        self.parse_pool = self._create_parse_pool()
+        try:
+            asyncio.run(self._run_async(domains))
+        except BrokenProcessPool:
+            logger.error("Parse workers crashed again after a restart; aborting the crawl.")
+            return
+        finally:
+            self.parse_pool.shutdown(cancel_futures=True)
+            self.save_results(output_file)
         logger.info("Crawling completed.")
 
+    async def _run_async(self, domains):
+        """Crawls all domains concurrently over one shared connection pool."""
+        self.semaphore = asyncio.Semaphore(self.max_workers)
+        # Idle connections stay open across the politeness delay so that pages of
+        # the same host reuse the TCP/TLS session; lookups are cached per host.
+        connector = aiohttp.TCPConnector(
+            limit=max(200, self.max_workers),
+            # Never below --host-workers, or workers would queue for a connection
+            # and that wait would count against the request timeout
+            limit_per_host=max(8, self.per_host_concurrency),
+            keepalive_timeout=60,
+            use_dns_cache=True,
+            ttl_dns_cache=600,
+            resolver=create_resolver(),
+        )
+        async with aiohttp.ClientSession(headers=self.headers, connector=connector) as session:
+            tasks = [
+                asyncio.create_task(self.crawl_domain(session, domain))
+                for domain in domains
+            ]
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_EXCEPTION)
+                for task in done:
+                    error = task.exception()
+                    if isinstance(error, BrokenProcessPool):
+                        # Nothing can be parsed any more, so stop every domain
+                        for other in pending:
+                            other.cancel()
+                        await asyncio.gather(*pending, return_exceptions=True)
+                        raise error
+                    if error is not None:
+                        logger.error(f"Domain crawl failed: {error!r}")
+
+    def open_results(self, output_file):
+        """Opens the output CSV and writes its header; rows are appended while crawling."""
+        self._csv_file = open(output_file, 'w', newline='', encoding='utf-8')
+        self._csv_writer = csv.writer(self._csv_file)
+        self._csv_writer.writerow(["URL", "Matched Word"])
+
     def save_results(self, output_file):
-        """Saves the results to a CSV file."""
+        """Closes the output CSV once crawling has finished."""
         try:
-            with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
-                fieldnames = ["URL", "Matched Word"]
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writeheader()
-                for match in self.found_matches:
-                    writer.writerow(match)
+            self._csv_file.close()
             logger.info(f"Results saved to {output_file}")
-            logger.info(f"Total matches found: {len(self.found_matches)}")
+            logger.info(f"Total matches found: {self.match_count}")
         except Exception as e:
             logger.error(f"Error saving results: {e}")
 
 # --- Helper Functions ---
+def url_netloc(url):
+    """Returns the netloc of a normalized URL without re-parsing it."""
+    return url.partition("://")[2].split("/", 1)[0]
+
+def normalize_url(url):
+    """
+    Canonicalizes a URL for deduplication: lowercases the host, drops the
+    default port and the fragment, sorts query parameters and strips
+    trailing slashes from the path. http and https map to the same key,
+    since fetch_page picks the scheme per host anyway. Returns None for
+    unparsable URLs.
+    """
+    try:
+        p = urlsplit(url)
+        port = p.port
+    except ValueError:
+        return None
+    netloc = p.hostname or ""
+    if ":" in netloc:
+        netloc = f"[{netloc}]"  # IPv6 literal
+    if port and port != {"http": 80, "https": 443}.get(p.scheme):
+        netloc += f":{port}"
+    path = p.path.rstrip("/") or "/"
+    query = urlencode(sorted(parse_qsl(p.query, keep_blank_values=True)))
+    scheme = "https" if p.scheme == "http" else p.scheme
+    return urlunsplit((scheme, netloc, path, query, ""))
+
+def create_seen_set():
+    """Returns a URL membership set, a Bloom filter when pybloom-live is installed."""
+    if ScalableBloomFilter is None:
+        return set()
+    return ScalableBloomFilter(initial_capacity=10_000, error_rate=1e-4)
+
+def utf8_boundary(data, limit):
+    """
+    Returns the largest offset <= limit that does not split a UTF-8
+    character, so a truncated Bangla page does not end mid-character.
+    """
+    if len(data) <= limit:
+        return len(data)
+    cut = limit
+    # Continuation bytes look like 0b10xxxxxx; back up to the lead byte
+    while cut > 0 and data[cut] & 0xC0 == 0x80:
+        cut -= 1
+    return cut
+
+def decode_body(body, charset):
+    """
+    Returns a page body ready for the HTML parser. Valid UTF-8 bodies stay
+    as raw bytes, which the parser decodes natively. Pages that declare
+    another charset, or whose bytes are not valid UTF-8, are decoded in
+    Python with replacement characters, since the parser drops any text
+    node it cannot decode.
+    """
+    if not charset or charset.lower().replace("_", "-") in ("utf-8", "utf8"):
+        try:
+            body.decode("utf-8")
+        except UnicodeDecodeError:
+            return body.decode("utf-8", errors="replace")
+        return body
+    try:
+        return body.decode(charset, errors="replace")
+    except LookupError:
+        return body
+
+def create_resolver():
+    """Returns an aiodns-backed resolver when available, else aiohttp's default."""
+    try:
+        import aiodns  # noqa: F401
+    except ImportError:
+        return aiohttp.DefaultResolver()
+    return aiohttp.AsyncResolver()
+
+def install_event_loop(backend="auto"):
+    """
+    Selects the event loop. "auto" uses uvloop's libuv loop when installed
+    (Linux/macOS only) and falls back to asyncio's default loop.
+    Returns False if the requested backend is unavailable.
+    """
+    if backend == "asyncio":
+        return True
+    try:
+        import uvloop
+    except ImportError:
+        return backend == "auto"
+    uvloop.install()
+    logger.info("Using uvloop event loop.")
+    return True
+
 def create_sample_files():
     """Creates sample input files for testing."""
     sample_domains = ["example.com", "wikipedia.org"]
@@ -185,7 +658,11 @@ def main():
     parser.add_argument("--words", help="Path to the file containing Bangla words.")
     parser.add_argument("--output", default="results.csv", help="Path for the output CSV file.")
     parser.add_argument("--max-pages", type=int, default=100, help="Maximum pages to crawl per domain.")
-    parser.add_argument("--workers", type=int, default=10, help="Number of concurrent workers.")
+    parser.add_argument("--workers", type=int, default=10, help="Maximum number of concurrent requests.")
+    parser.add_argument("--host-workers", type=int, default=4, help="Concurrent page fetches per domain.")
+    parser.add_argument("--deny-pattern", help="Regular expression; matching URLs are not crawled.")
+    parser.add_argument("--backend", choices=["auto", "asyncio", "uvloop"], default="auto",
+                        help="Event loop backend. 'auto' prefers uvloop when installed.")
     parser.add_argument("--create-samples", action="store_true", help="Creates sample input files.")
     
     args = parser.parse_args()
@@ -196,7 +673,20 @@ def main():
 
     if not args.domains or not args.words:
         parser.error("The --domains and --words arguments are required unless --create-samples is used.")
-    
+
+    if args.workers < 1 or args.host_workers < 1:
+        parser.error("--workers and --host-workers must be at least 1.")
+
+    if not install_event_loop(args.backend):
+        parser.error(f"The '{args.backend}' backend is not installed.")
+
+    deny_pattern = None
+    if args.deny_pattern:
+        try:
+            deny_pattern = re.compile(args.deny_pattern)
+        except re.error as e:
+            parser.error(f"Invalid --deny-pattern: {e}")
+
     domains = load_file_content(args.domains)
     words = load_file_content(args.words)
     
@@ -204,12 +694,15 @@ def main():
         return
 
     crawler = BanglaWebCrawler(
+        keywords=words,
         max_pages_per_domain=args.max_pages,
         delay=1, # Fixed delay to be polite to websites
-        max_workers=args.workers
+        max_workers=args.workers,
+        per_host_concurrency=args.host_workers,
+        deny_pattern=deny_pattern
     )
     
-    crawler.run(domains, words, args.output)
+    crawler.run(domains, args.output)
 
 if __name__ == "__main__":
     main()